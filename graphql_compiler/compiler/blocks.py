@@ -1,28 +1,97 @@
 # Copyright 2017-present Kensho Technologies, LLC.
-"""Definitions of the basic blocks of the compiler."""
+"""Definitions of the basic blocks of the compiler.
 
-from typing import Callable, Dict, Set
+Blocks validate themselves on construction, except when Python runs with optimizations enabled
+(python -O), since the compiler only constructs blocks from inputs it has already checked.
+Code that constructs blocks from untrusted inputs should call their validate() method explicitly.
+"""
 
-import six
+from typing import AbstractSet, Any, Callable, Dict, FrozenSet, Optional, Tuple
 
 from .compiler_entities import BasicBlock, Expression, MarkerBlock
 from .helpers import (
+    ALLOWED_EDGE_DIRECTIONS,
+    SAFE_STRING_REGEX,
     BaseLocation,
     FoldScopeLocation,
     ensure_unicode_string,
     safe_quoted_string,
-    validate_edge_direction,
     validate_marked_location,
     validate_safe_string,
 )
 
 
+# Gremlin code templates used by the blocks below. They are constant, so they are defined once here
+# instead of being rebuilt every time a block is emitted.
+_GREMLIN_TRAVERSE_TEMPLATE = "%s(%s)"
+# Traverses only if the edge exists, and otherwise replaces the pipeline element with "null".
+_GREMLIN_OPTIONAL_TRAVERSE_TEMPLATE = "ifThenElse{it.%s_%s == null}{null}{it.%s(%s)}"
+# Applies the given step only if the pipeline element is not "null".
+_GREMLIN_NULL_SAFE_STEP_TEMPLATE = "ifThenElse{it == null}{null}{it.%s}"
+_GREMLIN_RECURSE_TEMPLATE = "copySplit(%s).exhaustMerge"
+_GREMLIN_RECURSE_BASE = "_()"
+_GREMLIN_RECURSE_TRAVERSAL_TEMPLATE = ".%s('%s')"
+
+
+def _check_type(value: Any, expected_type: type, field_name: str) -> None:
+    """Raise TypeError if the given value is not an instance of the expected type."""
+    if not isinstance(value, expected_type):
+        raise TypeError(
+            f"Expected {expected_type.__name__} {field_name}, got: {type(value).__name__} {value}"
+        )
+
+
+def _validate_edge_direction(direction: str) -> None:
+    """Ensure that the given edge direction is either "in" or "out"."""
+    # Valid directions pass a single combined check; only invalid ones are examined further.
+    if not isinstance(direction, str) or direction not in ALLOWED_EDGE_DIRECTIONS:
+        _check_type(direction, str, "direction")
+        raise ValueError(f"Unrecognized edge direction: {direction}")
+
+
+def _validate_output_field(name: str, expression: Expression) -> None:
+    """Ensure that the given output field name and its Expression are valid for ConstructResult."""
+    validate_safe_string(name)
+    if not isinstance(expression, Expression):
+        raise TypeError(
+            "Expected Expression values in the fields dict, got: {} -> {}".format(name, expression)
+        )
+
+
+def _validate_class_names(class_names: AbstractSet[str], field_name: str) -> None:
+    """Ensure that the given class names are a frozenset of safe strings, raising otherwise."""
+    if not (isinstance(class_names, frozenset) and all(isinstance(x, str) for x in class_names)):
+        raise TypeError(
+            "Expected set of string {}, got: {} {}".format(
+                field_name, type(class_names).__name__, class_names
+            )
+        )
+
+    invalid_class_name = next(
+        (name for name in class_names if not SAFE_STRING_REGEX.fullmatch(name)), None
+    )
+    if invalid_class_name is not None:
+        # Produce the appropriate descriptive error for the invalid name.
+        validate_safe_string(invalid_class_name)
+
+
+def _freeze_class_names(class_names: AbstractSet[str], field_name: str) -> FrozenSet[str]:
+    """Return the given set of class names as a frozenset, raising TypeError on non-set input."""
+    if not isinstance(class_names, (set, frozenset)):
+        raise TypeError(
+            "Expected set of string {}, got: {} {}".format(
+                field_name, type(class_names).__name__, class_names
+            )
+        )
+    return frozenset(class_names)
+
+
 class QueryRoot(BasicBlock):
     """The starting object of the query to be compiled."""
 
-    __slots__ = ("start_class",)
+    __slots__ = ("start_class", "_gremlin_cache")
 
-    def __init__(self, start_class: Set[str]) -> None:
+    def __init__(self, start_class: AbstractSet[str]) -> None:
         """Construct a QueryRoot object that starts querying at the specified class name.
 
         Args:
@@ -31,37 +100,40 @@ class QueryRoot(BasicBlock):
                          with a non-final class, where we have to include all subclasses
                          of the start class. This is done using a Gremlin-only IR lowering step.
         """
-        super(QueryRoot, self).__init__(start_class)
-        self.start_class = start_class
-        self.validate()
+        # The class names are stored as a frozenset, which makes the block hashable.
+        frozen_start_class = _freeze_class_names(start_class, "start_class")
+        super(QueryRoot, self).__init__(frozen_start_class)
+        self.start_class = frozen_start_class
+        self._gremlin_cache: Optional[str] = None
+        if __debug__:
+            self.validate()
 
     def validate(self) -> None:
         """Ensure that the QueryRoot block is valid."""
-        if not (
-            isinstance(self.start_class, set)
-            and all(isinstance(x, six.string_types) for x in self.start_class)
-        ):
-            raise TypeError(
-                "Expected set of string start_class, got: {} {}".format(
-                    type(self.start_class).__name__, self.start_class
-                )
-            )
+        _validate_class_names(self.start_class, "start_class")
 
-        for cls in self.start_class:
-            validate_safe_string(cls)
+    def __hash__(self) -> int:
+        """Return the hash of the QueryRoot, which is fully determined by its start classes."""
+        return hash(self.start_class)
 
     def to_gremlin(self) -> str:
         """Return a unicode object with the Gremlin representation of this block."""
-        self.validate()
+        if self._gremlin_cache is not None:
+            return self._gremlin_cache
+
         if len(self.start_class) == 1:
             # The official Gremlin documentation claims that this approach
             # is generally faster than the one below, since it makes using indexes easier.
             # http://gremlindocs.spmallette.documentup.com/#filter/has
-            start_class = list(self.start_class)[0]
-            return "g.V({}, {})".format("'@class'", safe_quoted_string(start_class))
+            (only_start_class,) = self.start_class
+            result = f"g.V('@class', {safe_quoted_string(only_start_class)})"
         else:
-            start_classes_list = ",".join(safe_quoted_string(x) for x in self.start_class)
-            return "g.V.has('@class', T.in, [{}])".format(start_classes_list)
+            # Quote the class names in sorted order, for deterministic output.
+            start_classes_list = ",".join(safe_quoted_string(x) for x in sorted(self.start_class))
+            result = f"g.V.has('@class', T.in, [{start_classes_list}])"
+
+        self._gremlin_cache = result
+        return result
 
 
 class CoerceType(BasicBlock):
@@ -69,7 +141,7 @@ class CoerceType(BasicBlock):
 
     __slots__ = ("target_class",)
 
-    def __init__(self, target_class: Set[str]) -> None:
+    def __init__(self, target_class: AbstractSet[str]) -> None:
         """Construct a CoerceType object that filters out any data that is not of the given types.
 
         Args:
@@ -78,24 +150,20 @@ class CoerceType(BasicBlock):
                           with a non-final class, where we have to include all subclasses
                           of the target class. This is done using a Gremlin-only IR lowering step.
         """
-        super(CoerceType, self).__init__(target_class)
-        self.target_class = target_class
-        self.validate()
+        # The class names are stored as a frozenset, which makes the block hashable.
+        frozen_target_class = _freeze_class_names(target_class, "target_class")
+        super(CoerceType, self).__init__(frozen_target_class)
+        self.target_class = frozen_target_class
+        if __debug__:
+            self.validate()
 
     def validate(self) -> None:
         """Ensure that the CoerceType block is valid."""
-        if not (
-            isinstance(self.target_class, set)
-            and all(isinstance(x, six.string_types) for x in self.target_class)
-        ):
-            raise TypeError(
-                "Expected set of string target_class, got: {} {}".format(
-                    type(self.target_class).__name__, self.target_class
-                )
-            )
+        _validate_class_names(self.target_class, "target_class")
 
-        for cls in self.target_class:
-            validate_safe_string(cls)
+    def __hash__(self) -> int:
+        """Return the hash of the CoerceType, which is fully determined by its target classes."""
+        return hash(self.target_class)
 
     def to_gremlin(self) -> str:
         """Not implemented, should not be used."""
@@ -108,7 +176,7 @@ class CoerceType(BasicBlock):
 class ConstructResult(BasicBlock):
     """A transformation of the data into a new form, for output."""
 
-    __slots__ = ("fields",)
+    __slots__ = ("fields", "_sorted_keys", "_gremlin_cache")
 
     def __init__(self, fields: Dict[str, Expression]) -> None:
         """Construct a ConstructResult object that maps the given field names to their expressions.
@@ -117,27 +185,53 @@ class ConstructResult(BasicBlock):
             fields: dict, variable name string -> Expression
                     see rules for variable names in validate_safe_string().
         """
-        self.fields = {ensure_unicode_string(key): value for key, value in six.iteritems(fields)}
+        if __debug__:
+            _check_type(fields, dict, "fields")
+
+        # Normalize and validate the fields in a single pass over them.
+        normalized_fields = {}
+        for key, value in fields.items():
+            normalized_key = ensure_unicode_string(key)
+            if __debug__:
+                _validate_output_field(normalized_key, value)
+            normalized_fields[normalized_key] = value
+
+        # Sort the keys once for deterministic output order, since the fields never change.
+        self._initialize(normalized_fields, tuple(sorted(normalized_fields)))
+
+    def _initialize(self, fields: Dict[str, Expression], sorted_keys: Tuple[str, ...]) -> None:
+        """Set up the state of the block from its normalized fields and their sorted keys.
 
+        This is shared by all ways of constructing a ConstructResult, so that they always
+        initialize the same state.
+        """
         # All key values are normalized to unicode before being passed to the parent constructor,
         # which saves them to enable human-readable printing and other functions.
-        super(ConstructResult, self).__init__(self.fields)
-        self.validate()
+        super(ConstructResult, self).__init__(fields)
+        self.fields = fields
+        self._sorted_keys = sorted_keys
+        self._gremlin_cache: Optional[str] = None
+
+    @classmethod
+    def _from_prevalidated_fields(
+        cls, fields: Dict[str, Expression], sorted_keys: Tuple[str, ...]
+    ) -> "ConstructResult":
+        """Construct a ConstructResult from fields that have already been normalized and validated.
+
+        This skips the key normalization and validation that the regular constructor performs,
+        and must only be used with fields that are known to be valid. The sorted_keys argument
+        must contain the keys of the fields dict, in sorted order.
+        """
+        result = cls.__new__(cls)
+        result._initialize(fields, sorted_keys)
+        return result
 
     def validate(self) -> None:
         """Ensure that the ConstructResult block is valid."""
-        if not isinstance(self.fields, dict):
-            raise TypeError(
-                "Expected dict fields, got: {} {}".format(type(self.fields).__name__, self.fields)
-            )
+        _check_type(self.fields, dict, "fields")
 
-        for key, value in six.iteritems(self.fields):
-            validate_safe_string(key)
-            if not isinstance(value, Expression):
-                raise TypeError(
-                    "Expected Expression values in the fields dict, got: "
-                    "{} -> {}".format(key, value)
-                )
+        for key, value in self.fields.items():
+            _validate_output_field(key, value)
 
     def visit_and_update_expressions(
         self, visitor_fn: Callable[[Expression], Expression]
@@ -145,52 +239,58 @@ class ConstructResult(BasicBlock):
         """Create an updated version (if needed) of the ConstructResult via the visitor pattern."""
         new_fields = {}
 
-        for key, value in six.iteritems(self.fields):
+        for key, value in self.fields.items():
             new_value = value.visit_and_update(visitor_fn)
             if new_value is not value:
                 new_fields[key] = new_value
 
         if new_fields:
-            return ConstructResult(dict(self.fields, **new_fields))
+            # The keys are reused from this block's already-normalized fields, so only the values
+            # changed by the visitor need to be validated.
+            if __debug__:
+                for key, new_value in new_fields.items():
+                    _validate_output_field(key, new_value)
+            return ConstructResult._from_prevalidated_fields(
+                {**self.fields, **new_fields}, self._sorted_keys
+            )
         else:
             return self
 
     def to_gremlin(self) -> str:
         """Return a unicode object with the Gremlin representation of this block."""
-        self.validate()
+        if self._gremlin_cache is not None:
+            return self._gremlin_cache
 
-        template = (
-            "transform{{"
-            "it, m -> new com.orientechnologies.orient.core.record.impl.ODocument([ {} ])"
-            "}}"
+        field_representations = ", ".join(
+            f"{key}: {self.fields[key].to_gremlin()}" for key in self._sorted_keys
         )
-
-        field_representations = (
-            "{name}: {expr}".format(name=key, expr=self.fields[key].to_gremlin())
-            for key in sorted(self.fields.keys())  # Sort the keys for deterministic output order.
+        result = (
+            "transform{"
+            "it, m -> new com.orientechnologies.orient.core.record.impl.ODocument([ "
+            f"{field_representations} ])"
+            "}"
         )
-        return template.format(", ".join(field_representations))
+
+        self._gremlin_cache = result
+        return result
 
 
 class Filter(BasicBlock):
     """A filter that ensures data matches a predicate expression, and discards all other data."""
 
-    __slots__ = ("predicate",)
+    __slots__ = ("predicate", "_gremlin_cache")
 
     def __init__(self, predicate: Expression) -> None:
         """Create a new Filter with the specified Expression as a predicate."""
         super(Filter, self).__init__(predicate)
         self.predicate = predicate
-        self.validate()
+        self._gremlin_cache: Optional[str] = None
+        if __debug__:
+            self.validate()
 
     def validate(self) -> None:
         """Ensure that the Filter block is valid."""
-        if not isinstance(self.predicate, Expression):
-            raise TypeError(
-                "Expected Expression predicate, got: {} {}".format(
-                    type(self.predicate).__name__, self.predicate
-                )
-            )
+        _check_type(self.predicate, Expression, "predicate")
 
     def visit_and_update_expressions(
         self, visitor_fn: Callable[[Expression], Expression]
@@ -204,14 +304,19 @@ class Filter(BasicBlock):
 
     def to_gremlin(self) -> str:
         """Return a unicode object with the Gremlin representation of this block."""
-        self.validate()
-        return "filter{{it, m -> {}}}".format(self.predicate.to_gremlin())
+        if self._gremlin_cache is not None:
+            return self._gremlin_cache
+
+        result = f"filter{{it, m -> {self.predicate.to_gremlin()}}}"
+
+        self._gremlin_cache = result
+        return result
 
 
 class MarkLocation(BasicBlock):
     """A block that assigns a name to a given BaseLocation in the query."""
 
-    __slots__ = ("location",)
+    __slots__ = ("location", "_gremlin")
 
     def __init__(self, location: BaseLocation) -> None:
         """Create a new MarkLocation at the specified BaseLocation.
@@ -221,7 +326,11 @@ class MarkLocation(BasicBlock):
         """
         super(MarkLocation, self).__init__(location)
         self.location = location
-        self.validate()
+        if __debug__:
+            self.validate()
+
+        # The location never changes, so the Gremlin representation is computed only once.
+        self._gremlin = f"as({safe_quoted_string(location.get_location_name()[0])})"
 
     def validate(self) -> None:
         """Ensure that the MarkLocation block is valid."""
@@ -229,15 +338,19 @@ class MarkLocation(BasicBlock):
 
     def to_gremlin(self) -> str:
         """Return a unicode object with the Gremlin representation of this block."""
-        self.validate()
-        mark_name, _ = self.location.get_location_name()
-        return "as({})".format(safe_quoted_string(mark_name))
+        return self._gremlin
 
 
 class Traverse(BasicBlock):
     """A block that encodes a traversal across an edge, in either direction."""
 
-    __slots__ = ("direction", "edge_name", "optional", "within_optional_scope")
+    __slots__ = (
+        "direction",
+        "edge_name",
+        "optional",
+        "within_optional_scope",
+        "_gremlin_cache",
+    )
 
     def __init__(
         self,
@@ -264,32 +377,16 @@ class Traverse(BasicBlock):
         self.optional = optional
         # Denotes whether the traversal is occurring after a prior @optional traversal
         self.within_optional_scope = within_optional_scope
-        self.validate()
+        self._gremlin_cache: Optional[str] = None
+        if __debug__:
+            self.validate()
 
     def validate(self) -> None:
         """Ensure that the Traverse block is valid."""
-        if not isinstance(self.direction, six.string_types):
-            raise TypeError(
-                "Expected string direction, got: {} {}".format(
-                    type(self.direction).__name__, self.direction
-                )
-            )
-
-        validate_edge_direction(self.direction)
+        _validate_edge_direction(self.direction)
         validate_safe_string(self.edge_name)
-
-        if not isinstance(self.optional, bool):
-            raise TypeError(
-                "Expected bool optional, got: {} {}".format(
-                    type(self.optional).__name__, self.optional
-                )
-            )
-
-        if not isinstance(self.within_optional_scope, bool):
-            raise TypeError(
-                "Expected bool within_optional_scope, got: {} "
-                "{}".format(type(self.within_optional_scope).__name__, self.within_optional_scope)
-            )
+        _check_type(self.optional, bool, "optional")
+        _check_type(self.within_optional_scope, bool, "within_optional_scope")
 
     def get_field_name(self) -> str:
         """Return the field name corresponding to the edge being traversed."""
@@ -297,7 +394,10 @@ class Traverse(BasicBlock):
 
     def to_gremlin(self) -> str:
         """Return a unicode object with the Gremlin representation of this block."""
-        self.validate()
+        if self._gremlin_cache is not None:
+            return self._gremlin_cache
+
+        edge_quoted = safe_quoted_string(self.edge_name)
         if self.optional:
             # Optional edges have to be handled differently than non-optionals, since the compiler
             # provides the guarantee that properties read from an optional, non-existing location
@@ -312,32 +412,31 @@ class Traverse(BasicBlock):
             # as vertex properties named "<direction>_<edge_name>" where direction is "in" or "out".
             # For example, the links to outward edges named "Person_SpeechBy" from Person
             # are assumed to be stored as "out_Person_SpeechBy" on the Person node.
-            return (
-                "ifThenElse{{it.{direction}_{edge_name} == null}}"
-                "{{null}}{{it.{direction}({edge_quoted})}}".format(
-                    direction=self.direction,
-                    edge_name=self.edge_name,
-                    edge_quoted=safe_quoted_string(self.edge_name),
-                )
+            result = _GREMLIN_OPTIONAL_TRAVERSE_TEMPLATE % (
+                self.direction,
+                self.edge_name,
+                self.direction,
+                edge_quoted,
             )
         elif self.within_optional_scope:
             # During a traversal, the pipeline element may be null.
             # The following code returns null when the current pipeline entity is null
             # (an optional edge did not exist at some earlier traverse).
             # Otherwise it performs a normal traversal (previous optional edge did exist).
-            return "ifThenElse{{it == null}}{{null}}{{it.{direction}({edge_quoted})}}".format(
-                direction=self.direction, edge_quoted=safe_quoted_string(self.edge_name)
+            result = _GREMLIN_NULL_SAFE_STEP_TEMPLATE % (
+                _GREMLIN_TRAVERSE_TEMPLATE % (self.direction, edge_quoted)
             )
         else:
-            return "{direction}({edge})".format(
-                direction=self.direction, edge=safe_quoted_string(self.edge_name)
-            )
+            result = _GREMLIN_TRAVERSE_TEMPLATE % (self.direction, edge_quoted)
+
+        self._gremlin_cache = result
+        return result
 
 
 class Recurse(BasicBlock):
     """A block for recursive traversal of an edge, collecting all endpoints along the way."""
 
-    __slots__ = ("direction", "edge_name", "depth", "within_optional_scope")
+    __slots__ = ("direction", "edge_name", "depth", "within_optional_scope", "_gremlin_cache")
 
     def __init__(
         self, direction: str, edge_name: str, depth: int, within_optional_scope: bool = False
@@ -359,55 +458,52 @@ class Recurse(BasicBlock):
         self.depth = depth
         # Denotes whether the traversal is occurring after a prior @optional traversal
         self.within_optional_scope = within_optional_scope
-        self.validate()
+        self._gremlin_cache: Optional[str] = None
+        if __debug__:
+            self.validate()
 
     def validate(self) -> None:
         """Ensure that the Traverse block is valid."""
-        validate_edge_direction(self.direction)
+        _validate_edge_direction(self.direction)
         validate_safe_string(self.edge_name)
-
-        if not isinstance(self.within_optional_scope, bool):
-            raise TypeError(
-                "Expected bool within_optional_scope, got: {} "
-                "{}".format(type(self.within_optional_scope).__name__, self.within_optional_scope)
-            )
-
-        if not isinstance(self.depth, int):
-            raise TypeError(
-                "Expected int depth, got: {} {}".format(type(self.depth).__name__, self.depth)
-            )
+        _check_type(self.within_optional_scope, bool, "within_optional_scope")
+        _check_type(self.depth, int, "depth")
 
         if not (self.depth >= 1):
             raise ValueError("depth ({}) >= 1 does not hold!".format(self.depth))
 
     def to_gremlin(self) -> str:
         """Return a unicode object with the Gremlin representation of this block."""
-        self.validate()
-        template = "copySplit({recurse}).exhaustMerge"
-        recurse_base = "_()"
-        recurse_traversal = ".{direction}('{edge_name}')".format(
-            direction=self.direction, edge_name=self.edge_name
-        )
-
-        recurse_steps = [
-            recurse_base + (recurse_traversal * i) for i in six.moves.xrange(self.depth + 1)
-        ]
-        recursion_string = template.format(recurse=",".join(recurse_steps))
+        if self._gremlin_cache is not None:
+            return self._gremlin_cache
+
+        recurse_traversal = _GREMLIN_RECURSE_TRAVERSAL_TEMPLATE % (self.direction, self.edge_name)
+
+        # Each step extends the previous one by a single traversal, so build them incrementally
+        # rather than re-repeating the traversal string from scratch for every depth.
+        recurse_step = _GREMLIN_RECURSE_BASE
+        recurse_steps = [recurse_step]
+        for _ in range(self.depth):
+            recurse_step += recurse_traversal
+            recurse_steps.append(recurse_step)
+        recursion_string = _GREMLIN_RECURSE_TEMPLATE % ",".join(recurse_steps)
         if self.within_optional_scope:
             # During a traversal, the pipeline element may be null.
             # The following code returns null when the current pipeline entity is null
             # (an optional edge did not exist at some earlier traverse).
             # Otherwise it performs a normal recursion (previous optional edge did exist).
-            recurse_template = "ifThenElse{{it == null}}{{null}}{{it.{recursion_string}}}"
-            return recurse_template.format(recursion_string=recursion_string)
+            result = _GREMLIN_NULL_SAFE_STEP_TEMPLATE % recursion_string
         else:
-            return recursion_string
+            result = recursion_string
+
+        self._gremlin_cache = result
+        return result
 
 
 class Backtrack(BasicBlock):
     """A block that specifies a return to a given BaseLocation in the query."""
 
-    __slots__ = ("location", "optional")
+    __slots__ = ("location", "optional", "_gremlin")
 
     def __init__(self, location: BaseLocation, optional: bool = False) -> None:
         """Create a new Backtrack block, returning to the given location in the query.
@@ -420,31 +516,24 @@ class Backtrack(BasicBlock):
         super(Backtrack, self).__init__(location, optional=optional)
         self.location = location
         self.optional = optional
-        self.validate()
+        if __debug__:
+            self.validate()
+
+        # The block never changes, so its Gremlin representation is computed only once.
+        if optional:
+            operation = "optional"
+        else:
+            operation = "back"
+        self._gremlin = f"{operation}({safe_quoted_string(location.get_location_name()[0])})"
 
     def validate(self) -> None:
         """Ensure that the Backtrack block is valid."""
         validate_marked_location(self.location)
-        if not isinstance(self.optional, bool):
-            raise TypeError(
-                "Expected bool optional, got: {} {}".format(
-                    type(self.optional).__name__, self.optional
-                )
-            )
+        _check_type(self.optional, bool, "optional")
 
     def to_gremlin(self) -> str:
         """Return a unicode object with the Gremlin representation of this BasicBlock."""
-        self.validate()
-        if self.optional:
-            operation = "optional"
-        else:
-            operation = "back"
-
-        mark_name, _ = self.location.get_location_name()
-
-        return "{operation}({mark_name})".format(
-            operation=operation, mark_name=safe_quoted_string(mark_name)
-        )
+        return self._gremlin
 
 
 class OutputSource(MarkerBlock):
@@ -473,15 +562,12 @@ class Fold(MarkerBlock):
         """Create a new Fold block rooted at the given location."""
         super(Fold, self).__init__(fold_scope_location)
         self.fold_scope_location = fold_scope_location
-        self.validate()
+        if __debug__:
+            self.validate()
 
     def validate(self) -> None:
         """Ensure the Fold block is valid."""
-        if not isinstance(self.fold_scope_location, FoldScopeLocation):
-            raise TypeError(
-                "Expected a FoldScopeLocation for fold_scope_location, got: {} "
-                "{}".format(type(self.fold_scope_location), self.fold_scope_location)
-            )
+        _check_type(self.fold_scope_location, FoldScopeLocation, "fold_scope_location")
 
 
 class Unfold(MarkerBlock):
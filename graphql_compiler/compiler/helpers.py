@@ -3,6 +3,7 @@
 from abc import ABCMeta, abstractmethod
 from collections import namedtuple
 from functools import total_ordering
+import re
 import string
 from typing import Any, Collection, Dict, Hashable, Iterable, Optional, Tuple, TypeVar, Union, cast
 
@@ -33,6 +34,9 @@ STANDARD_DATE_FORMAT = "yyyy-MM-dd"
 STANDARD_DATETIME_FORMAT = "yyyy-MM-dd'T'HH:mm:ss"
 
 VARIABLE_ALLOWED_CHARS = frozenset(six.text_type(string.ascii_letters + string.digits + "_"))
+# Matches exactly the strings accepted by validate_safe_string(): non-empty strings made up of
+# VARIABLE_ALLOWED_CHARS that do not start with a digit. Use with fullmatch().
+SAFE_STRING_REGEX = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
 
 OUTBOUND_EDGE_DIRECTION = "out"
 INBOUND_EDGE_DIRECTION = "in"
@@ -244,19 +248,6 @@ def validate_output_name(name: str) -> None:
     validate_safe_string(name, value_description="output name")
 
 
-def validate_edge_direction(edge_direction: str) -> None:
-    """Ensure the provided edge direction is either "in" or "out"."""
-    if not isinstance(edge_direction, six.string_types):
-        raise TypeError(
-            "Expected string edge_direction, got: {} {}".format(
-                type(edge_direction), edge_direction
-            )
-        )
-
-    if edge_direction not in ALLOWED_EDGE_DIRECTIONS:
-        raise ValueError("Unrecognized edge direction: {}".format(edge_direction))
-
-
 def validate_marked_location(location: "BaseLocation") -> None:
     """Validate that a Location object is safe for marking, and not at a field."""
     if not isinstance(location, BaseLocation):
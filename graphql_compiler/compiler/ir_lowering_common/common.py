@@ -54,6 +54,8 @@ def merge_consecutive_filter_clauses(ir_blocks: List[BasicBlock]) -> List[BasicB
 class OutputContextVertex(ContextField):
     """An expression referring to a vertex location for output from the global context."""
 
+    __slots__ = ()
+
     def validate(self) -> None:
         """Validate that the OutputContextVertex is correctly representable."""
         super(OutputContextVertex, self).validate()
@@ -146,6 +146,8 @@ def rewrite_filters_in_optional_blocks(ir_blocks):
 class GremlinFoldedContextField(Expression):
     """A Gremlin-specific FoldedContextField that knows how to output itself as Gremlin."""
 
+    __slots__ = ("fold_scope_location", "folded_ir_blocks", "field_type")
+
     def __init__(self, fold_scope_location, folded_ir_blocks, field_type):
         """Create a new GremlinFoldedContextField."""
         super(GremlinFoldedContextField, self).__init__(
@@ -280,6 +282,8 @@ class GremlinFoldedContextField(Expression):
 class GremlinFoldedFilter(Filter):
     """A Gremlin-specific Filter block to be used only within @fold scopes."""
 
+    __slots__ = ()
+
     def to_gremlin(self):
         """Return a unicode object with the Gremlin representation of this block."""
         self.validate()
@@ -289,6 +293,8 @@ class GremlinFoldedFilter(Filter):
 class GremlinFoldedTraverse(Traverse):
     """A Gremlin-specific Traverse block to be used only within @fold scopes."""
 
+    __slots__ = ()
+
     @classmethod
     def from_traverse(cls, traverse_block):
         """Create a GremlinFoldedTraverse block as a copy of the given Traverse block."""
@@ -317,6 +323,8 @@ class GremlinFoldedTraverse(Traverse):
 class GremlinFoldedLocalField(LocalField):
     """A Gremlin-specific LocalField expression to be used only within @fold scopes."""
 
+    __slots__ = ()
+
     def get_local_object_gremlin_name(self):
         """Return the Gremlin name of the local object whose field is being produced."""
         return "entry"
@@ -73,6 +73,8 @@ def expression_list_to_conjunction(expression_list: Collection[Expression]) -> E
 class BetweenClause(Expression):
     """A `BETWEEN` Expression, constraining a field value to lie within a lower and upper bound."""
 
+    __slots__ = ("field", "lower_bound", "upper_bound")
+
     def __init__(self, field: LocalField, lower_bound: Expression, upper_bound: Expression) -> None:
         """Construct an expression that is true when the field value is within the given bounds.
 
@@ -62,6 +62,8 @@ class ContextColumn(expressions.Expression):
     in the test schema.
     """
 
+    __slots__ = ("_vertex_query_path", "_column_name")
+
     def __init__(self, vertex_query_path, column_name):
         """Construct a new ContextColumn."""
         super(ContextColumn, self).__init__(vertex_query_path, column_name)
@@ -0,0 +1,189 @@
+# Copyright 2021-present Kensho Technologies, LLC.
+from copy import deepcopy
+import pickle
+from typing import Iterator, Type
+import unittest
+
+from graphql import GraphQLString
+
+from ..compiler.blocks import (
+    Backtrack,
+    CoerceType,
+    ConstructResult,
+    MarkLocation,
+    QueryRoot,
+    Recurse,
+    Traverse,
+    Unfold,
+)
+from ..compiler.compiler_entities import CompilerEntity
+from ..compiler.expressions import LocalField, OutputContextField, TrueLiteral
+from ..compiler.helpers import SAFE_STRING_REGEX, Location, validate_safe_string
+from ..exceptions import GraphQLCompilationError
+
+
+def _get_all_subclasses(cls: Type) -> Iterator[Type]:
+    """Yield all direct and indirect subclasses of the given class."""
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _get_all_subclasses(subclass)
+
+
+class CompilerEntityTests(unittest.TestCase):
+    def test_all_compiler_entities_define_slots(self) -> None:
+        # Importing the compiler package imports all modules that define compiler entities,
+        # so all of them are visible as subclasses of CompilerEntity here.
+        #
+        # Compiler entities are created in large numbers, so their instances must not carry
+        # a per-instance __dict__. That requires every class in their hierarchy to define __slots__.
+        for entity_cls in _get_all_subclasses(CompilerEntity):
+            for cls in entity_cls.__mro__:
+                if cls is not object:
+                    self.assertIn(
+                        "__slots__",
+                        vars(cls),
+                        msg="{} in the hierarchy of {} does not define __slots__".format(
+                            cls.__name__, entity_cls.__name__
+                        ),
+                    )
+
+    def test_compiler_entity_instances_have_no_dict(self) -> None:
+        location = Location(("Animal",))
+        entities = [
+            QueryRoot({"Animal"}),
+            MarkLocation(location),
+            Traverse("out", "Animal_ParentOf"),
+            Backtrack(location),
+            Unfold(),
+            LocalField("name", GraphQLString),
+        ]
+        for entity in entities:
+            self.assertFalse(hasattr(entity, "__dict__"), msg=str(entity))
+
+
+class SafeStringValidationTests(unittest.TestCase):
+    def test_safe_string_regex_agrees_with_validate_safe_string(self) -> None:
+        # QueryRoot and CoerceType check class names against SAFE_STRING_REGEX and only fall back
+        # to validate_safe_string() for names the regex rejects. The two must therefore agree,
+        # otherwise unsafe class names could end up in the emitted query.
+        test_values = [
+            "",
+            "Animal",
+            "_Animal",
+            "Animal_2",
+            "2Animal",
+            "9",
+            "Änimal",
+            "Animalé",
+            "Животное",
+            "Animal\n",
+            "Animal\r",
+            "\nAnimal",
+            "Ani mal",
+            "Animal'",
+            'Animal"',
+            "Animal.name",
+            "Animal-Name",
+            "Animal$",
+            "Animal;",
+            "Animal٣",
+        ]
+        for value in test_values:
+            try:
+                validate_safe_string(value)
+            except GraphQLCompilationError:
+                is_valid = False
+            else:
+                is_valid = True
+            self.assertEqual(
+                is_valid, SAFE_STRING_REGEX.fullmatch(value) is not None, msg=repr(value)
+            )
+
+    def test_invalid_class_names_are_rejected(self) -> None:
+        # The blocks are validated explicitly, since python -O skips validation on construction.
+        for invalid_name in ("", "2Animal", "Animal\n", "Animal'", "Änimal"):
+            with self.assertRaises(GraphQLCompilationError):
+                QueryRoot({"Animal", invalid_name}).validate()
+            with self.assertRaises(GraphQLCompilationError):
+                CoerceType({"Animal", invalid_name}).validate()
+
+
+class ClassNameBlockTests(unittest.TestCase):
+    def test_class_name_blocks_are_hashable(self) -> None:
+        for block_cls in (QueryRoot, CoerceType):
+            from_set = block_cls({"Animal", "Species"})
+            from_frozenset = block_cls(frozenset({"Species", "Animal"}))
+            self.assertEqual(from_set, from_frozenset)
+            self.assertEqual(hash(from_set), hash(from_frozenset))
+
+            blocks_dict = {from_set: 1}
+            blocks_dict[from_frozenset] = 2
+            blocks_dict[block_cls({"Animal"})] = 3
+            self.assertEqual(2, len(blocks_dict))
+            self.assertEqual(2, blocks_dict[block_cls({"Animal", "Species"})])
+
+    def test_class_names_are_stored_as_frozensets(self) -> None:
+        query_root = QueryRoot({"Animal"})
+        self.assertEqual(frozenset({"Animal"}), query_root.start_class)
+        self.assertIsInstance(query_root.start_class, frozenset)
+        self.assertEqual("QueryRoot((frozenset({'Animal'}),))", str(query_root))
+
+        coerce_type = CoerceType({"Animal"})
+        self.assertEqual(frozenset({"Animal"}), coerce_type.target_class)
+        self.assertIsInstance(coerce_type.target_class, frozenset)
+        self.assertEqual("CoerceType((frozenset({'Animal'}),))", str(coerce_type))
+
+    def test_non_set_class_names_are_rejected(self) -> None:
+        for invalid_value in ("Animal", ["Animal"], ("Animal",), {"Animal": 1}, None):
+            with self.assertRaises(TypeError):
+                QueryRoot(invalid_value)  # type: ignore
+            with self.assertRaises(TypeError):
+                CoerceType(invalid_value)  # type: ignore
+
+
+class EdgeDirectionValidationTests(unittest.TestCase):
+    def test_invalid_edge_directions_are_rejected(self) -> None:
+        for invalid_direction in ("", "both", "In", "out "):
+            with self.assertRaisesRegex(ValueError, "Unrecognized edge direction"):
+                Traverse(invalid_direction, "Animal_ParentOf").validate()
+            with self.assertRaisesRegex(ValueError, "Unrecognized edge direction"):
+                Recurse(invalid_direction, "Animal_ParentOf", 1).validate()
+
+    def test_non_string_edge_directions_are_rejected(self) -> None:
+        for invalid_direction in (5, None, ["in"]):
+            expected_message = "Expected str direction, got: {} {}".format(
+                type(invalid_direction).__name__, invalid_direction
+            )
+            with self.assertRaises(TypeError) as traverse_context:
+                Traverse(invalid_direction, "Animal_ParentOf").validate()  # type: ignore
+            self.assertEqual(expected_message, str(traverse_context.exception))
+            with self.assertRaises(TypeError) as recurse_context:
+                Recurse(invalid_direction, "Animal_ParentOf", 1).validate()  # type: ignore
+            self.assertEqual(expected_message, str(recurse_context.exception))
+
+
+class ConstructResultTests(unittest.TestCase):
+    def test_construct_result_round_trips_through_deepcopy_and_pickle(self) -> None:
+        base_location = Location(("Animal",))
+        construct_result = ConstructResult(
+            {
+                "name": OutputContextField(base_location.navigate_to_field("name"), GraphQLString),
+                "uuid": OutputContextField(base_location.navigate_to_field("uuid"), GraphQLString),
+            }
+        )
+        # Populate the cached Gremlin representation before copying the block.
+        expected_gremlin = construct_result.to_gremlin()
+
+        for copied_construct_result in (
+            deepcopy(construct_result),
+            pickle.loads(pickle.dumps(construct_result)),
+        ):
+            self.assertIsNot(construct_result, copied_construct_result)
+            self.assertEqual(construct_result, copied_construct_result)
+            self.assertEqual(construct_result.fields, copied_construct_result.fields)
+            self.assertEqual(expected_gremlin, copied_construct_result.to_gremlin())
+
+    @unittest.skipUnless(__debug__, "ConstructResult fields are not type-checked under python -O")
+    def test_construct_result_rejects_non_dict_fields(self) -> None:
+        with self.assertRaisesRegex(TypeError, "Expected dict fields"):
+            ConstructResult([("a", TrueLiteral)])  # type: ignore
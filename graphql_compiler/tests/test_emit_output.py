@@ -13,8 +13,10 @@ from ..compiler.blocks import (
     GlobalOperationsStart,
     MarkLocation,
     QueryRoot,
+    Recurse,
     Traverse,
 )
+from ..compiler.compiler_entities import Expression
 from ..compiler.cypher_query import convert_to_cypher_query
 from ..compiler.expressions import (
     BinaryComposition,
@@ -447,6 +449,122 @@ class EmitGremlinTests(unittest.TestCase):
         received_gremlin = emit_gremlin.emit_code_from_ir(self.schema_info, ir_blocks)
         compare_gremlin(self, expected_gremlin, received_gremlin)
 
+    def test_repeated_emission_of_same_blocks(self) -> None:
+        base_location = Location(("Animal",))
+        base_name_location = base_location.navigate_to_field("name")
+        child_location = base_location.navigate_to_subpath("out_Animal_ParentOf")
+
+        ir_blocks = [
+            QueryRoot({"Animal"}),
+            MarkLocation(base_location),
+            Recurse("out", "Animal_ParentOf", 2),
+            MarkLocation(child_location),
+            Backtrack(base_location),
+            GlobalOperationsStart(),
+            ConstructResult({"name": OutputContextField(base_name_location, GraphQLString)}),
+        ]
+
+        expected_gremlin = """
+            g.V('@class', 'Animal')
+            .as('Animal___1')
+            .copySplit(
+                _(),
+                _().out('Animal_ParentOf'),
+                _().out('Animal_ParentOf').out('Animal_ParentOf')
+            ).exhaustMerge
+            .as('Animal__out_Animal_ParentOf___1')
+            .back('Animal___1')
+            .transform{it, m -> new com.orientechnologies.orient.core.record.impl.ODocument([
+                name: m.Animal___1.name
+            ])}
+        """
+
+        # Emitting the same blocks more than once must always produce the same output.
+        for _ in range(2):
+            received_gremlin = emit_gremlin.emit_code_from_ir(self.schema_info, ir_blocks)
+            compare_gremlin(self, expected_gremlin, received_gremlin)
+
+    def test_query_root_with_multiple_start_classes(self) -> None:
+        base_location = Location(("Animal",))
+        base_name_location = base_location.navigate_to_field("name")
+
+        ir_blocks = [
+            QueryRoot({"Species", "Animal", "Food"}),
+            MarkLocation(base_location),
+            GlobalOperationsStart(),
+            ConstructResult({"name": OutputContextField(base_name_location, GraphQLString)}),
+        ]
+
+        # The start classes are always emitted in sorted order.
+        expected_gremlin = """
+            g.V.has('@class', T.in, ['Animal','Food','Species'])
+            .as('Animal___1')
+            .transform{it, m -> new com.orientechnologies.orient.core.record.impl.ODocument([
+                name: m.Animal___1.name
+            ])}
+        """
+
+        received_gremlin = emit_gremlin.emit_code_from_ir(self.schema_info, ir_blocks)
+        compare_gremlin(self, expected_gremlin, received_gremlin)
+
+    def test_construct_result_updated_by_visitor(self) -> None:
+        base_location = Location(("Animal",))
+        base_name_location = base_location.navigate_to_field("name")
+        base_uuid_location = base_location.navigate_to_field("uuid")
+        base_color_location = base_location.navigate_to_field("color")
+
+        name_field = OutputContextField(base_name_location, GraphQLString)
+        uuid_field = OutputContextField(base_uuid_location, GraphQLString)
+        color_field = OutputContextField(base_color_location, GraphQLString)
+        construct_result = ConstructResult({"name": name_field, "uuid": uuid_field})
+
+        def replace_name_with_color(expression: Expression) -> Expression:
+            """Replace the "name" output field expression with the "color" one."""
+            if expression is name_field:
+                return color_field
+            return expression
+
+        updated_construct_result = construct_result.visit_and_update_expressions(
+            replace_name_with_color
+        )
+        expected_construct_result = ConstructResult({"name": color_field, "uuid": uuid_field})
+        self.assertEqual(expected_construct_result, updated_construct_result)
+        self.assertEqual(
+            expected_construct_result.to_gremlin(), updated_construct_result.to_gremlin()
+        )
+        # The original block is left unchanged.
+        self.assertEqual(
+            ConstructResult({"name": name_field, "uuid": uuid_field}), construct_result
+        )
+
+        if __debug__:
+            # Visitors that produce non-Expression values are rejected.
+            def replace_name_with_none(expression: Expression) -> Expression:
+                """Replace the "name" output field expression with a non-Expression value."""
+                return None if expression is name_field else expression  # type: ignore
+
+            with self.assertRaisesRegex(TypeError, "Expected Expression values in the fields dict"):
+                construct_result.visit_and_update_expressions(replace_name_with_none)
+
+        ir_blocks = [
+            QueryRoot({"Animal"}),
+            MarkLocation(base_location),
+            GlobalOperationsStart(),
+            updated_construct_result,
+        ]
+
+        expected_gremlin = """
+            g.V('@class', 'Animal')
+            .as('Animal___1')
+            .transform{it, m -> new com.orientechnologies.orient.core.record.impl.ODocument([
+                name: m.Animal___1.color,
+                uuid: m.Animal___1.uuid
+            ])}
+        """
+
+        received_gremlin = emit_gremlin.emit_code_from_ir(self.schema_info, ir_blocks)
+        compare_gremlin(self, expected_gremlin, received_gremlin)
+
 
 class EmitCypherTests(unittest.TestCase):
     """Test emit_code_from_ir method for Cypher.